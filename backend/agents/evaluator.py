@@ -1,15 +1,21 @@
+import asyncio
 import os
+import time
 from openai import OpenAI
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from database.verdict_cache import VerdictCache
 
 class EvaluatorAgent:
     """Evaluates response quality and accuracy using LLM verification"""
     
-    def __init__(self, model="gpt-4o-mini"):
+    def __init__(self, model="gpt-4o-mini", verdict_cache: Optional[VerdictCache] = None):
         self.model = model
         api_key = os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key)
+        # Verification runs at temperature 0.0, so identical (response, sources) pairs get identical verdicts
+        self.verdict_cache = verdict_cache or VerdictCache()
     
     async def evaluate(
         self, 
@@ -20,7 +26,8 @@ class EvaluatorAgent:
         """Evaluate response quality and calculate confidence"""
         
         # Calculate confidence based on multiple factors
-        confidence = self._calculate_confidence(response, sources)
+        # Run the blocking verification call off the event loop
+        confidence = await asyncio.to_thread(self._calculate_confidence, response, sources)
         
         # Extract response text
         response_text = response.get("text", "")
@@ -47,6 +54,12 @@ class EvaluatorAgent:
         """Calculate confidence score using LLM verification"""
         
         response_text = response.get("text", "")
+        
+        cache_key = self.verdict_cache.make_key(response_text, sources)
+        cached = self.verdict_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Format sources for the LLM
         context_text = "\n\n".join([f"Source: {s.get('content', '')}" for s in sources])
         
@@ -73,6 +86,7 @@ class EvaluatorAgent:
         """
         
         try:
+            start = time.perf_counter()
             evaluation = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -84,7 +98,9 @@ class EvaluatorAgent:
             )
             
             result = json.loads(evaluation.choices[0].message.content)
-            return float(result.get("confidence_score", 0.5))
+            confidence = float(result.get("confidence_score", 0.5))
+            self.verdict_cache.put(cache_key, confidence, time.perf_counter() - start)
+            return confidence
             
         except Exception as e:
             print(f"Evaluation failed: {e}")
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from openai import OpenAI
 import json
@@ -33,7 +34,8 @@ class PlannerAgent:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a strategic planner for a search agent. Output JSON only."},
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from openai import OpenAI
 from typing import List, Dict
@@ -27,7 +28,8 @@ class ReasonerAgent:
         
         try:
             # Call OpenAI API
-            response = self.client.chat.completions.create(
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a helpful British Airways customer service assistant. Use the provided context to answer questions accurately."},
@@ -21,15 +21,7 @@ class RetrieverAgent:
                     top_k=10 # Increase context window
                 )
                 
-                return [
-                    {
-                        "content": r["text"],
-                        "source": r["source"],
-                        "score": r["score"],
-                        "metadata": r.get("metadata", {})
-                    }
-                    for r in results
-                ]
+                return self._to_context(results)
             except Exception as e:
                 print(f"Vector store error: {e}")
                 return self._get_fallback_context(plan["query_type"])
@@ -37,6 +29,36 @@ class RetrieverAgent:
         # Fallback: return basic context based on query type
         return self._get_fallback_context(plan["query_type"])
     
+    async def retrieve_batch(self, queries: List[str], plans: List[Dict], top_k: int = 8) -> List[List[Dict]]:
+        """Retrieve documents for several queries with a single batched vector search"""
+        
+        if self.vector_store:
+            try:
+                results = self.vector_store.search_batch(
+                    queries=queries,
+                    query_type="general",
+                    top_k=10
+                )
+                return [self._to_context(r) for r in results]
+            except Exception as e:
+                # Answer from the fallback context rather than with no context at all
+                print(f"Vector store error: {e}")
+        
+        return [self._get_fallback_context(plan.get("query_type", "general")) for plan in plans]
+    
+    def _to_context(self, results: List[Dict]) -> List[Dict]:
+        """Convert vector store results into the context format used by the agents"""
+        return [
+            {
+                "id": r.get("id"),
+                "content": r["text"],
+                "source": r["source"],
+                "score": r["score"],
+                "metadata": r.get("metadata", {})
+            }
+            for r in results
+        ]
+    
     def _get_fallback_context(self, query_type: str) -> List[Dict]:
         """Provide basic context when vector store unavailable"""
         
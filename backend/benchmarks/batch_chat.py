@@ -0,0 +1,69 @@
+# backend/benchmarks/batch_chat.py
+"""Compare /chat/batch against a sequential /chat loop using the stub LLM.
+
+The stub planner always answers "informational" so every query takes the full LLM
+pipeline instead of the facts index, and the verdict cache is emptied before each
+run so neither side gets free evaluator hits.
+
+Run from the backend directory:
+    python -m benchmarks.batch_chat --queries 50 --latency 0.2 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import Response
+
+from benchmarks import stubs
+
+QUESTIONS = [
+    "Can I take a 150ml bottle of shampoo in my hand luggage?",
+    "How big can the liquids bag be?",
+    "Can I bring my insulin on the plane?",
+    "What is the battery limit for power banks?",
+    "Can I carry baby milk through security?",
+]
+
+
+async def run(num_queries: int, concurrency: int):
+    import main
+    await main.startup()  # Not run for us, since the app isn't served
+
+    messages = [QUESTIONS[i % len(QUESTIONS)] for i in range(num_queries)]
+
+    main.verdict_cache.clear()
+    start = time.perf_counter()
+    for message in messages:
+        await main.chat(main.ChatRequest(message=message), Response())
+    sequential = time.perf_counter() - start
+
+    main.verdict_cache.clear()
+    start = time.perf_counter()
+    response = await main.chat_batch(main.BatchChatRequest(
+        messages=[main.ChatRequest(message=m) for m in messages],
+        max_concurrency=concurrency
+    ))
+    lines = [json.loads(line) async for line in response.body_iterator]
+    batched = time.perf_counter() - start
+
+    errors = sum(1 for line in lines if "error" in line)
+    print(f"\n📊 {num_queries} queries, concurrency {concurrency}")
+    print(f"   Sequential /chat : {sequential:.2f}s ({num_queries / sequential:.1f} q/s)")
+    print(f"   /chat/batch      : {batched:.2f}s ({num_queries / batched:.1f} q/s), {errors} errors")
+    print(f"   Speed-up         : {sequential / batched:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub LLM/embedding latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    stubs.install(llm_latency=args.latency, intent="informational")
+    asyncio.run(run(args.queries, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
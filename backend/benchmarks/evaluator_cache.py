@@ -0,0 +1,62 @@
+# backend/benchmarks/evaluator_cache.py
+"""Measure the evaluator verdict cache hit rate and latency saved using the stub LLM.
+
+Replays answers from data/feedback_history.json with a popularity skew, the way
+popular questions recur in production. Run from the backend directory:
+    python -m benchmarks.evaluator_cache --requests 200 --latency 0.3
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from benchmarks import stubs
+
+FEEDBACK_FILE = "../data/feedback_history.json"
+
+
+async def run(num_requests: int, seed: int):
+    from agents.evaluator import EvaluatorAgent
+    from database.verdict_cache import VerdictCache
+
+    with open(FEEDBACK_FILE, "r") as f:
+        answers = [entry for entry in json.load(f) if entry.get("response")]
+
+    # Zipf-like skew: the first answers are asked about far more often than the rest
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(answers))]
+    replay = rng.choices(answers, weights=weights, k=num_requests)
+    sources = [{"id": f"doc_{i}", "content": text} for i, (_, _, text) in enumerate(stubs.STUB_SECTIONS)]
+
+    async def timed(evaluator: EvaluatorAgent) -> float:
+        start = time.perf_counter()
+        for entry in replay:
+            await evaluator.evaluate(entry["query"] or "", {"text": entry["response"]}, sources)
+        return time.perf_counter() - start
+
+    uncached = await timed(EvaluatorAgent(verdict_cache=VerdictCache(max_entries=0)))
+    cache = VerdictCache()
+    cached = await timed(EvaluatorAgent(verdict_cache=cache))
+
+    stats = cache.stats()
+    print(f"\n📊 {num_requests} evaluations over {len(answers)} distinct answers")
+    print(f"   Hit rate                 : {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses)")
+    print(f"   Without cache            : {uncached:.2f}s ({uncached / num_requests * 1000:.0f}ms per evaluation)")
+    print(f"   With cache               : {cached:.2f}s ({cached / num_requests * 1000:.0f}ms per evaluation)")
+    print(f"   Estimated seconds saved  : {stats['estimated_seconds_saved']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.3, help="stub LLM latency in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    stubs.install(llm_latency=args.latency)
+    asyncio.run(run(args.requests, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# backend/benchmarks/ingest.py
+"""Benchmark directory ingestion, int8 index size and int8 recall loss.
+
+Ingest throughput is measured on a synthetic corpus of copies of the policy page,
+embedded by the stub OpenAI client. Recall is measured on clustered synthetic
+vectors, since stub embeddings are random and would make every method look perfect.
+Run from the backend directory:
+    python -m benchmarks.ingest --files 100 --latency 0.2
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import stubs
+
+SOURCE_FILE = "../data/ba_liquids_and_restrictions.txt"
+
+
+def build_corpus(corpus_dir: str, num_files: int):
+    """Write num_files distinct copies of the policy page"""
+    with open(SOURCE_FILE, "r", encoding="utf-8") as f:
+        content = f.read()
+    for i in range(num_files):
+        page = content.replace("British Airways", f"British Airways (page {i})")
+        with open(os.path.join(corpus_dir, f"policy_{i:05d}.txt"), "w", encoding="utf-8") as f:
+            f.write(page)
+
+
+def bench_ingest(num_files: int, workers: int, batch_size: int):
+    from database.vector_store import VectorStore
+
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    work_dir = tempfile.mkdtemp()
+    try:
+        corpus_dir = os.path.join(work_dir, "corpus")
+        os.makedirs(corpus_dir)
+        build_corpus(corpus_dir, num_files)
+
+        store = VectorStore(persist_dir=os.path.join(work_dir, "index"), quantize=True)
+        start = time.perf_counter()
+        store.load_directory(corpus_dir, workers=workers, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+
+        chunks = store.count()
+        int8_bytes = store.index.memory_bytes()
+        float_bytes = chunks * stubs.EMBEDDING_DIM * 4
+        print(f"\n📊 Ingest: {num_files} files, {chunks} chunks in {elapsed:.2f}s ({chunks / elapsed:.0f} chunks/s)")
+        print(f"   Embedding calls : {store.openai_client.embeddings.calls} (batch size {batch_size})")
+        print(f"   float32 vectors : {float_bytes / 1e6:.1f} MB")
+        print(f"   int8 + scales   : {int8_bytes / 1e6:.1f} MB ({float_bytes / int8_bytes:.1f}x smaller in memory)")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def bench_recall(num_vectors: int, num_queries: int, top_k: int, seed: int):
+    from database.quantized_index import QuantizedIndex
+
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(max(num_vectors // 50, 1), stubs.EMBEDDING_DIM)).astype(np.float32)
+    vectors = centroids[rng.integers(len(centroids), size=num_vectors)]
+    vectors += 0.6 * rng.normal(size=vectors.shape).astype(np.float32)
+    queries = vectors[rng.integers(num_vectors, size=num_queries)]
+    queries += 0.6 * rng.normal(size=queries.shape).astype(np.float32)
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        index = QuantizedIndex(work_dir)
+        ids = [str(i) for i in range(num_vectors)]
+        index.add(ids, vectors, [""] * num_vectors, [{} for _ in range(num_vectors)])
+        index.save()
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        q_normalized = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        exact = np.argsort(-(q_normalized @ normalized.T), axis=1)[:, :top_k]
+        int8_only = np.argsort(-index._approximate_scores(q_normalized), axis=1)[:, :top_k]
+
+        start = time.perf_counter()
+        rescored = index.search_batch(queries, top_k=top_k)
+        search_ms = (time.perf_counter() - start) / num_queries * 1000
+
+        def recall(found) -> float:
+            return np.mean([len(set(map(int, f)) & set(e)) / top_k for f, e in zip(found, exact)])
+
+        rescored_ids = [[r["id"] for r in results] for results in rescored]
+        print(f"\n📊 Recall@{top_k}: {num_vectors} clustered vectors, {num_queries} queries")
+        print(f"   int8 only             : {recall(int8_only):.4f}")
+        print(f"   int8 + float32 rescore: {recall(rescored_ids):.4f} ({search_ms:.1f}ms per query)")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub embedding latency in seconds")
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    stubs.install(llm_latency=args.latency, patch_vector_store=False)
+    bench_ingest(args.files, args.workers, args.batch_size)
+    bench_recall(args.vectors, args.queries, args.top_k, args.seed)
+
+
+if __name__ == "__main__":
+    main()
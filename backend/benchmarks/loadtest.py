@@ -0,0 +1,232 @@
+# backend/benchmarks/loadtest.py
+"""Replay recorded query mixes against /chat at fixed arrival rates and report SLO metrics.
+
+Conversations arrive as a Poisson process at each rate in --rates. A share of them
+are multi-turn and reuse the conversation_id returned by their first turn. Queries
+come from data/feedback_history.json, or from --mix (a JSON list of conversations,
+each a list of messages). Conversations arriving while --max-in-flight are already
+running are shed.
+
+Typical run, with the backend pointed at the stub OpenAI server:
+    python -m benchmarks.stub_openai_server --port 9000 &
+    OPENAI_BASE_URL=http://localhost:9000/v1 OPENAI_API_KEY=stub VECTOR_STORE_DIR=/tmp/loadtest_index \\
+        uvicorn main:app --port 8000 &
+    python -m benchmarks.loadtest --url http://localhost:8000 --rates 1,2,4 --duration 60
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+FEEDBACK_FILE = "../data/feedback_history.json"
+STAGES = ["planner", "facts", "retriever", "reasoner", "evaluator"]
+
+
+def load_query_mix(mix_file: Optional[str]) -> Dict:
+    """Recorded conversations from --mix, or single queries seeded from the feedback history"""
+    if mix_file:
+        with open(mix_file, "r") as f:
+            return {"conversations": json.load(f), "queries": []}
+
+    with open(FEEDBACK_FILE, "r") as f:
+        entries = json.load(f)
+    return {"conversations": [], "queries": [e["query"] for e in entries if e.get("query")]}
+
+
+def build_conversation(mix: Dict, rng: random.Random, multi_turn: float, max_turns: int) -> List[str]:
+    """Pick a recorded conversation, or assemble one of 1..max_turns turns from the query mix"""
+    if mix["conversations"]:
+        return rng.choice(mix["conversations"])
+    turns = rng.randint(2, max_turns) if max_turns > 1 and rng.random() < multi_turn else 1
+    return [rng.choice(mix["queries"]) for _ in range(turns)]
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """'planner;dur=812.3, retriever;dur=95.0' -> {'planner': 812.3, 'retriever': 95.0}"""
+    timings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.startswith("dur="):
+            timings[name] = float(params[4:])
+    return timings
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class StageResult:
+    """Outcome of every request sent at one arrival rate"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.sent = 0
+        self.ok = 0
+        self.errors = 0
+        self.shed = 0  # 429/503 responses from the server
+        self.shed_locally = 0  # Turns of conversations dropped by --max-in-flight
+        self.elapsed = 0.0
+        self.latencies: Dict[str, List[float]] = {"total": []}
+
+    def record(self, status: int, total_ms: float, timings: Dict[str, float]):
+        self.sent += 1
+        if status in (429, 503):
+            self.shed += 1
+        elif status >= 400:
+            self.errors += 1
+        else:
+            self.ok += 1
+            self.latencies["total"].append(total_ms)
+            for stage, ms in timings.items():
+                self.latencies.setdefault(stage, []).append(ms)
+
+    def summary(self) -> Dict:
+        attempted = self.sent + self.shed_locally
+        return {
+            "rate": self.rate,
+            "requests": attempted,
+            "completed": self.ok,
+            "throughput_rps": round(self.ok / self.elapsed, 2) if self.elapsed else 0.0,
+            "error_rate": round(self.errors / attempted, 4) if attempted else 0.0,
+            "shed_rate": round((self.shed + self.shed_locally) / attempted, 4) if attempted else 0.0,
+            "latency_ms": {
+                name: {f"p{p}": round(percentile(values, p), 1) for p in (50, 95, 99)}
+                for name, values in self.latencies.items()
+                if name == "total" or name in STAGES
+            }
+        }
+
+
+async def run_conversation(client: httpx.AsyncClient, turns: List[str], result: StageResult, timeout: float):
+    conversation_id = None
+    for message in turns:
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/chat", json={"message": message, "conversation_id": conversation_id}, timeout=timeout
+            )
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 599  # Timeouts and connection failures count as errors
+            response = None
+        total_ms = (time.perf_counter() - start) * 1000
+
+        timings = parse_server_timing(response.headers.get("server-timing", "")) if response is not None else {}
+        result.record(status, total_ms, timings)
+        if status >= 400:
+            return
+        conversation_id = response.json()["conversation_id"]
+
+
+async def sample_memory(client: httpx.AsyncClient, samples: List[Dict], started: float, interval: float):
+    """Poll /health for ConversationMemory size until cancelled"""
+    while True:
+        try:
+            health = (await client.get("/health", timeout=5.0)).json()
+            samples.append({"t": round(time.perf_counter() - started, 1), **health.get("conversation_memory", {})})
+        except (httpx.HTTPError, ValueError):
+            pass
+        await asyncio.sleep(interval)
+
+
+async def run_stage(client: httpx.AsyncClient, rate: float, args, mix: Dict, rng: random.Random) -> StageResult:
+    """Open-loop arrivals at `rate` conversations/s for args.duration seconds"""
+    result = StageResult(rate)
+    in_flight = set()
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < args.duration:
+        await asyncio.sleep(rng.expovariate(rate))
+        turns = build_conversation(mix, rng, args.multi_turn, args.max_turns)
+        if len(in_flight) >= args.max_in_flight:
+            result.shed_locally += len(turns)
+            continue
+        task = asyncio.create_task(run_conversation(client, turns, result, args.timeout))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def print_report(summaries: List[Dict], samples: List[Dict]):
+    for s in summaries:
+        print(f"\n📊 Arrival rate {s['rate']} conversations/s")
+        print(f"   Requests {s['requests']}, completed {s['completed']}, throughput {s['throughput_rps']} req/s")
+        print(f"   Error rate {s['error_rate']:.2%}, shed rate {s['shed_rate']:.2%}")
+        print(f"   {'stage':<10} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)")
+        for name in ["total"] + STAGES:
+            if name in s["latency_ms"]:
+                p = s["latency_ms"][name]
+                print(f"   {name:<10} {p['p50']:>9} {p['p95']:>9} {p['p99']:>9}")
+
+    if len(samples) >= 2:
+        first, last = samples[0], samples[-1]
+        minutes = max((last["t"] - first["t"]) / 60, 1e-9)
+        growth = (last.get("content_bytes", 0) - first.get("content_bytes", 0)) / minutes
+        print("\n🧠 ConversationMemory over time")
+        print(f"   {'t (s)':>7} {'conversations':>14} {'messages':>9} {'bytes':>10}")
+        for sample in samples:
+            print(f"   {sample['t']:>7} {sample.get('conversations', 0):>14} "
+                  f"{sample.get('messages', 0):>9} {sample.get('content_bytes', 0):>10}")
+        print(f"   Growth: {growth / 1024:.1f} KiB/min")
+
+
+async def run(args):
+    mix = load_query_mix(args.mix)
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.max_in_flight)
+    samples: List[Dict] = []
+
+    # The sampler gets its own client: sharing the capped pool would starve /health polls
+    # exactly when the load, and the memory curve, matter most
+    async with httpx.AsyncClient(base_url=args.url, limits=limits) as client, \
+            httpx.AsyncClient(base_url=args.url) as health_client:
+        sampler = asyncio.create_task(
+            sample_memory(health_client, samples, time.perf_counter(), args.sample_interval)
+        )
+        summaries = []
+        for rate in args.rates:
+            print(f"🚦 Replaying at {rate} conversations/s for {args.duration}s...")
+            summaries.append((await run_stage(client, rate, args, mix, rng)).summary())
+        sampler.cancel()
+
+    print_report(summaries, samples)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump({"stages": summaries, "conversation_memory": samples}, f, indent=2)
+        print(f"\n📝 Report written to {args.json_out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--rates", type=lambda v: [float(r) for r in v.split(",")], default=[1.0, 2.0, 4.0],
+                        help="comma-separated arrival rates in conversations/s, run in order")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds per arrival rate")
+    parser.add_argument("--mix", default=None, help="JSON list of recorded conversations (lists of messages)")
+    parser.add_argument("--multi-turn", type=float, default=0.3, help="share of generated conversations with follow-ups")
+    parser.add_argument("--max-turns", type=int, default=3)
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--sample-interval", type=float, default=5.0, help="seconds between memory samples")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json-out", default=None)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# backend/benchmarks/stub_openai_server.py
+"""Local stand-in for the OpenAI chat and embeddings endpoints, with configurable latency.
+
+Point the backend at it through the OpenAI client's standard environment variables:
+    python -m benchmarks.stub_openai_server --port 9000 --chat-latency lognormal:0.6:0.4
+
+The planner intent is derived from each query by default (--intent auto), so allowance
+checks exercise the facts stage; pass a fixed intent to force every query down one path.
+    OPENAI_BASE_URL=http://localhost:9000/v1 OPENAI_API_KEY=stub uvicorn main:app
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Dict, List, Optional, Union
+
+import uvicorn
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from benchmarks.stubs import INTENTS, StubLatency, stub_completion_content, stub_embedding
+
+app = FastAPI(title="Stub OpenAI API")
+app.state.chat_latency = StubLatency.from_spec("lognormal:0.6:0.4")
+app.state.embedding_latency = StubLatency.from_spec("lognormal:0.15:0.3", seed=43)
+app.state.intent = "auto"
+
+
+class ChatCompletionRequest(BaseModel):
+    model: str
+    messages: List[Dict]
+    response_format: Optional[Dict] = None
+
+
+class EmbeddingRequest(BaseModel):
+    model: str
+    input: Union[str, List[str]]
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: ChatCompletionRequest):
+    await asyncio.sleep(app.state.chat_latency.draw())
+    content = stub_completion_content(request.messages, request.response_format, app.state.intent)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: EmbeddingRequest):
+    await asyncio.sleep(app.state.embedding_latency.draw())
+    texts = [request.input] if isinstance(request.input, str) else request.input
+    return {
+        "object": "list",
+        "data": [
+            {"object": "embedding", "index": i, "embedding": stub_embedding(text)}
+            for i, text in enumerate(texts)
+        ],
+        "model": request.model,
+        "usage": {"prompt_tokens": 0, "total_tokens": 0}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--chat-latency", default="lognormal:0.6:0.4",
+                        help="distribution:base:jitter for chat completions, e.g. uniform:0.5:0.1")
+    parser.add_argument("--embedding-latency", default="lognormal:0.15:0.3",
+                        help="distribution:base:jitter for embeddings")
+    parser.add_argument("--intent", default="auto", choices=INTENTS,
+                        help="planner intent to return; auto derives it from the query")
+    args = parser.parse_args()
+
+    app.state.chat_latency = StubLatency.from_spec(args.chat_latency)
+    app.state.embedding_latency = StubLatency.from_spec(args.embedding_latency, seed=43)
+    app.state.intent = args.intent
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# backend/benchmarks/stubs.py
+"""Stand-ins for OpenAI and the vector store so the pipeline can be benchmarked offline.
+
+Call `install()` BEFORE importing `main`: the agents and the vector store bind
+`OpenAI`/`VectorStore` at import time, so patching afterwards has no effect.
+"""
+import hashlib
+import json
+import random
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+import numpy as np
+
+EMBEDDING_DIM = 1536
+INTENTS = ("auto", "allowance-check", "informational", "specific-restriction")
+
+_PLANNER_QUERY = re.compile(r'Query: "(.*?)"\n', re.DOTALL)
+_ALLOWANCE_WORDS = re.compile(
+    r"\b(limits?|max|maximum|allowance|allowed|size|how (much|many|big|large|heavy))\b"
+    r"|\d+(\.\d+)?\s*(ml|l|litres?|liters?|kg|g|cm|wh)\b",
+    re.IGNORECASE
+)
+
+STUB_SECTIONS = [
+    ("Liquids", "liquids", "Each liquid must be in its own container, measuring no more than 100ml (3.4oz). "
+                           "All liquids must be put in a single, transparent, re-sealable plastic bag of up to "
+                           "20 x 20cm (8 x 8in) with a total capacity of up to 1 litre."),
+    ("Batteries of up to 100Wh", "electronics", "Spare batteries of up to 100Wh must be carried in hand baggage "
+                                                "and protected from short circuit."),
+    ("Medical supplies", "medical", "Essential medication can be carried in hand baggage and may exceed the "
+                                    "standard liquid limits if you have a prescription."),
+]
+
+
+class StubLatency:
+    """Latency model shared by the stubs, in seconds.
+
+    "uniform" draws base +/- jitter; "lognormal" draws a long-tailed delay with median
+    `base` and shape `jitter` (sigma), closer to real LLM latencies.
+    """
+
+    def __init__(self, base: float = 0.2, jitter: float = 0.05, seed: int = 42, distribution: str = "uniform"):
+        if distribution not in ("uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.base = base
+        self.jitter = jitter
+        self.distribution = distribution
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_spec(cls, spec: str, seed: int = 42) -> "StubLatency":
+        """Parse 'uniform:0.4:0.1' or 'lognormal:0.4:0.5' (distribution:base:jitter)"""
+        distribution, base, jitter = spec.split(":")
+        return cls(base=float(base), jitter=float(jitter), seed=seed, distribution=distribution)
+
+    def draw(self) -> float:
+        if self.distribution == "lognormal":
+            return self.base * self._random.lognormvariate(0.0, self.jitter)
+        return max(0.0, self.base + self._random.uniform(-self.jitter, self.jitter))
+
+    def sleep(self):
+        time.sleep(self.draw())
+
+
+def stub_intent(query: str) -> str:
+    """Planner intent a real model would likely give: allowance-check when the query names a limit or size"""
+    return "allowance-check" if _ALLOWANCE_WORDS.search(query) else "informational"
+
+
+def stub_completion_content(messages: List[Dict], response_format: Dict = None, intent: str = "auto") -> str:
+    """Canned completion text; JSON requests get a payload valid for the planner and the evaluator.
+
+    With intent "auto" the planner intent is derived from the query, so allowance checks
+    reach the facts index as they would with the real model; any other value is returned as is.
+    """
+    if response_format and response_format.get("type") == "json_object":
+        prompt = messages[-1]["content"]
+        match = _PLANNER_QUERY.search(prompt)
+        query = match.group(1) if match else prompt
+        return json.dumps({
+            "query_type": "liquids",
+            "keywords": ["liquids", "hand baggage"],
+            "intent": stub_intent(query) if intent == "auto" else intent,
+            "priority": "medium",
+            "search_queries": [query[:80]],
+            "supported": True,
+            "confidence_score": 0.9,
+            "reasoning": "stub"
+        })
+    return "Each liquid must be in its own container of no more than 100ml. " \
+           "Is there anything else I can help you with regarding your journey?"
+
+
+def stub_embedding(text: str) -> List[float]:
+    """Deterministic pseudo-embedding so identical texts map to identical vectors"""
+    seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+    return np.random.default_rng(seed).uniform(-1.0, 1.0, EMBEDDING_DIM).tolist()
+
+
+class _StubCompletions:
+    def __init__(self, latency: StubLatency, intent: str = "auto"):
+        self.latency = latency
+        self.intent = intent
+        self.calls = 0
+
+    def create(self, model: str, messages: List[Dict], response_format: Dict = None, **kwargs):
+        self.calls += 1
+        self.latency.sleep()
+        content = stub_completion_content(messages, response_format, self.intent)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class _StubEmbeddings:
+    def __init__(self, latency: StubLatency):
+        self.latency = latency
+        self.calls = 0
+
+    def create(self, input, model: str, **kwargs):
+        self.calls += 1
+        self.latency.sleep()
+        texts = [input] if isinstance(input, str) else list(input)
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=stub_embedding(text)) for i, text in enumerate(texts)
+        ])
+
+
+class StubOpenAI:
+    """Drop-in for `openai.OpenAI` exposing only the endpoints this backend uses"""
+
+    latency = StubLatency()
+    intent = "auto"
+
+    def __init__(self, api_key: str = None, **kwargs):
+        self.chat = SimpleNamespace(completions=_StubCompletions(self.latency, self.intent))
+        self.embeddings = _StubEmbeddings(self.latency)
+
+
+class StubVectorStore:
+    """Drop-in for `VectorStore` that serves canned sections through the stub embeddings"""
+
+    def __init__(self, persist_dir: str = None, quantize: bool = False):
+        self.openai_client = StubOpenAI()
+        self.initialized = True
+
+    def load_documents(self, file_path: str):
+        pass
+
+    def load_directory(self, data_dir: str, workers: int = None, batch_size: int = 256, corpus_version: str = None):
+        pass
+
+    def search(self, query: str, query_type: str = "general", top_k: int = 5) -> List[Dict]:
+        self.openai_client.embeddings.create(input=query, model="stub")
+        return self._results(top_k)
+
+    def search_batch(self, queries: List[str], query_type: str = "general", top_k: int = 5) -> List[List[Dict]]:
+        self.openai_client.embeddings.create(input=queries, model="stub")
+        return [self._results(top_k) for _ in queries]
+
+    def _results(self, top_k: int) -> List[Dict]:
+        return [
+            {
+                "text": text,
+                "source": "ba_liquids_and_restrictions.txt",
+                "score": 0.8 - 0.1 * i,
+                "metadata": {"source": "ba_liquids_and_restrictions.txt", "section": title, "category": category}
+            }
+            for i, (title, category, text) in enumerate(STUB_SECTIONS[:top_k])
+        ]
+
+
+def install(llm_latency: float = 0.2, jitter: float = 0.05, patch_vector_store: bool = True, intent: str = "auto"):
+    """Patch `openai.OpenAI`, and unless told otherwise `database.vector_store.VectorStore`, with the stubs"""
+    import openai
+
+    StubOpenAI.latency = StubLatency(base=llm_latency, jitter=jitter)
+    StubOpenAI.intent = intent
+    openai.OpenAI = StubOpenAI
+
+    import database.vector_store
+    if patch_vector_store:
+        database.vector_store.VectorStore = StubVectorStore
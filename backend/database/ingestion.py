@@ -0,0 +1,167 @@
+# backend/database/ingestion.py
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+POLICY_EXTENSIONS = (".txt", ".md")
+MAX_CHUNK_CHARS = 4000  # Keeps every chunk well inside the embedding model's input limit
+
+
+def list_policy_files(data_dir: str) -> List[str]:
+    """Policy documents in a directory (recursive), in a stable order"""
+    paths = []
+    for root, _, files in os.walk(data_dir):
+        for name in files:
+            if name.endswith(POLICY_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def corpus_fingerprint(paths: List[str], data_dir: str = None) -> str:
+    """Hash of the names and contents of every policy file"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(source_name(path, data_dir).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def source_name(file_path: str, data_dir: str = None) -> str:
+    """Path of a policy file relative to the corpus root; unique even when file names repeat"""
+    if data_dir is None:
+        return os.path.basename(file_path)
+    return os.path.relpath(file_path, data_dir).replace(os.sep, "/")
+
+
+def parse_file(file_path: str, data_dir: str = None) -> List[Dict]:
+    """Read a policy file and split it into chunks ready for embedding.
+
+    Chunk IDs and sources use the path relative to `data_dir`, so files with the same
+    name in different subfolders don't collide. Runs in a worker process, so it must
+    stay a module-level function.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    source = source_name(file_path, data_dir)
+    chunks = []
+    for section in split_into_sections(content):
+        for text in _split_long_text(section["text"]):
+            chunks.append({
+                "id": f"{source}:{len(chunks)}",
+                "text": text,
+                "metadata": {
+                    "source": source,
+                    "section": section["title"],
+                    "category": section["category"]
+                }
+            })
+    return chunks
+
+
+def ingest_directory(vector_store, data_dir: str, workers: int = None, batch_size: int = 256) -> int:
+    """Parse every policy file in a process pool and stream the chunks to batched embedding.
+
+    Files are parsed in parallel while the main process embeds whatever has already
+    come back, one OpenAI call per `batch_size` chunks. Returns the number of chunks added.
+    """
+    paths = list_policy_files(data_dir)
+    if not paths:
+        print(f"⚠️ No policy documents found in {data_dir}")
+        return 0
+
+    print(f"📚 Ingesting {len(paths)} policy files from {data_dir}")
+    added = 0
+    pending: List[Dict] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(parse_file, path, data_dir): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                pending.extend(future.result())
+            except Exception as e:
+                print(f"❌ Error parsing {futures[future]}: {e}")
+                continue
+
+            while len(pending) >= batch_size:
+                added += vector_store.add_chunks(pending[:batch_size])
+                pending = pending[batch_size:]
+
+    if pending:
+        added += vector_store.add_chunks(pending)
+
+    vector_store.finish_ingest()
+    print(f"✅ Ingested {added} chunks from {len(paths)} files")
+    return added
+
+
+def split_into_sections(content: str) -> List[Dict]:
+    """Split content into meaningful sections"""
+    sections = []
+    lines = content.split('\n')
+
+    current_section = {"title": "Introduction", "text": "", "category": "general"}
+    current_text = []
+
+    for line in lines:
+        # Check if this is a section header
+        if line.startswith('===') or line.startswith('---'):
+            # Save previous section if it has content
+            if current_text:
+                current_section["text"] = '\n'.join(current_text).strip()
+                if len(current_section["text"]) > 50:  # Only add substantial sections
+                    sections.append(current_section.copy())
+                current_text = []
+
+            # Start new section
+            current_section["title"] = line.strip('= -')
+            current_section["category"] = categorize(line)
+        else:
+            if line.strip():
+                current_text.append(line)
+
+    # Add last section
+    if current_text:
+        current_section["text"] = '\n'.join(current_text).strip()
+        if len(current_section["text"]) > 50:
+            sections.append(current_section)
+
+    return sections
+
+
+def categorize(title: str) -> str:
+    """Categorize section based on title"""
+    title_lower = title.lower()
+
+    if any(word in title_lower for word in ["liquid", "powder", "gel", "aerosol"]):
+        return "liquids"
+    elif any(word in title_lower for word in ["medical", "medicine", "pregnant", "health"]):
+        return "medical"
+    elif any(word in title_lower for word in ["sport", "bike", "golf", "ski", "equipment"]):
+        return "sports"
+    elif any(word in title_lower for word in ["prohibited", "forbidden", "restricted", "banned"]):
+        return "prohibited"
+    elif any(word in title_lower for word in ["battery", "electronic", "device", "laptop"]):
+        return "electronics"
+    elif any(word in title_lower for word in ["baggage", "luggage", "bag", "allowance"]):
+        return "baggage"
+    else:
+        return "general"
+
+
+def _split_long_text(text: str) -> List[str]:
+    """Break an oversized section on line boundaries into pieces of at most MAX_CHUNK_CHARS"""
+    if len(text) <= MAX_CHUNK_CHARS:
+        return [text]
+
+    pieces, current = [], ""
+    for line in text.split('\n'):
+        if current and len(current) + len(line) + 1 > MAX_CHUNK_CHARS:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        pieces.append(current)
+    return pieces
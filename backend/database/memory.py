@@ -45,6 +45,18 @@ class ConversationMemory:
         
         return "\n".join(context_parts)
     
+    def stats(self) -> Dict:
+        """Size of the stored history, used to watch memory growth under load"""
+        messages = sum(len(history) for history in self.conversations.values())
+        content_bytes = sum(
+            len(msg["content"].encode("utf-8")) for history in self.conversations.values() for msg in history
+        )
+        return {
+            "conversations": len(self.conversations),
+            "messages": messages,
+            "content_bytes": content_bytes
+        }
+    
     def clear_conversation(self, conversation_id: str):
         """Clear a specific conversation"""
         if conversation_id in self.conversations:
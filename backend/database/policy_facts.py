@@ -0,0 +1,271 @@
+# backend/database/policy_facts.py
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+# The value is quoted verbatim, but picking the rule from the query can still go wrong,
+# more so when another item also matched and lost on specificity
+_CONFIDENCE = 0.9
+_CONTESTED_CONFIDENCE = 0.75
+
+_WORD_NUMBERS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "ten": 10}
+
+# The numeric limits have exceptions for these; the LLM path explains them properly.
+# Mobility aids have their own 300Wh battery limit, e-vehicles are banned outright and
+# spare batteries are limited by count, so none of them get the 100Wh device rating.
+_EXCEPTION_TERMS = ("medic", "prescription", "insulin", "baby", "babies", "infant", "duty-free", "duty free",
+                    "wheelchair", "mobility", "scooter", "e-bike", "ebike", "hoverboard", "hover board",
+                    "segway", "skateboard", "spare")
+
+# Queries about checked luggage, where hand-baggage-only limits don't apply
+_HOLD_BAGGAGE = re.compile(r"\b(checked|check-in|check in|hold|suitcase)\b")
+# Queries about the cabin, where hold-only limits don't apply
+_HAND_BAGGAGE = re.compile(r"\b(hand|cabin|carry-on|carry on|on board|security)\b")
+
+# Usually under 24% ABV: no quantity limit in the hold, the 100ml rule in hand baggage
+_LOW_ABV_DRINKS = ("wine", "beer", "lager", "cider", "champagne", "prosecco", "sake")
+
+
+@dataclass(frozen=True)
+class FactRule:
+    """How to find one numeric rule in the policy text"""
+    item: str
+    constraint: str
+    unit: str
+    aliases: Tuple[str, ...]  # Lower-case phrases that identify the item in a user query
+    pattern: str  # Regex whose first group captures the value
+    generic_aliases: Tuple[str, ...] = ()  # Words like "bottle" that lose to any specific alias
+    hand_baggage_only: bool = False  # The limit does not apply to checked baggage
+    hold_only: bool = False  # Only for checked baggage (or duty-free purchases), not hand baggage
+
+
+@dataclass(frozen=True)
+class PolicyFact:
+    """A single hard numeric rule extracted from the policy documents"""
+    item: str
+    constraint: str
+    value: Union[float, Tuple[float, ...]]  # Tuple for dimensions such as 20 x 20cm
+    unit: str
+    section: str
+    source: str
+    text: str  # The sentence the value was extracted from
+    hand_baggage_only: bool = False
+    hold_only: bool = False
+
+
+# The numbers are read from the documents, so a policy update changes the answers
+# without touching this table; only a reworded sentence needs a new pattern.
+FACT_RULES = [
+    FactRule("liquid container", "maximum volume in hand baggage", "ml",
+             ("liquid", "shampoo", "toiletries", "perfume"),
+             r"own container, measuring no more than (\d+)ml",
+             generic_aliases=("bottle", "container"), hand_baggage_only=True),
+    FactRule("liquids bag", "maximum size", "cm",
+             ("liquids bag", "plastic bag", "clear bag", "bag for liquids"),
+             r"bag of up to (\d+ x \d+)cm", hand_baggage_only=True),
+    FactRule("liquids bag", "maximum total capacity", "litre",
+             ("liquids bag", "plastic bag", "clear bag", "bag for liquids"),
+             r"total capacity of up to (\d+) litre", hand_baggage_only=True),
+    FactRule("powders on flights to the US", "maximum weight in hand baggage", "g",
+             ("powder",),
+             r"up to (\d+)g \([^)]*\) of powdered", hand_baggage_only=True),
+    FactRule("lithium-ion battery or power bank", "maximum rating without approval", "Wh",
+             ("power bank", "powerbank", "lithium-ion", "lithium ion", "battery", "batteries"),
+             r"lithium-ion batteries must not exceed (\d+)Wh"),
+    FactRule("lithium metal battery", "maximum lithium content", "g",
+             ("lithium metal",),
+             r"Lithium metal batteries must not exceed (\d+)g lithium"),
+    FactRule("alcoholic drinks", "maximum volume per person between 24% and 70% ABV", "litres",
+             ("alcohol", "spirits", "whisky", "whiskey", "vodka", "gin", "rum", "tequila", "brandy"),
+             r"up to (\w+) litres of alcohol", hold_only=True),
+    FactRule("alcoholic drinks", "maximum alcohol volume permitted", "%",
+             ("alcohol", "spirits", "whisky", "whiskey", "vodka", "gin", "rum", "tequila", "brandy"),
+             r"above (\d+)% alcohol volume are not permitted"),
+    FactRule("expressed breast milk", "maximum volume at some airports", "litres",
+             ("breast milk",),
+             r"up to (\d+) litres of liquid expressed breast milk"),
+    FactRule("dry ice", "maximum weight per person", "kg",
+             ("dry ice",),
+             r"maximum of ([\d.]+)kg dry ice per person"),
+    FactRule("ammunition", "maximum weight per person", "kg",
+             ("ammunition", "cartridges for weapons"),
+             r"limit of (\d+)kg \([^)]*\) of ammunition"),
+    FactRule("knives", "maximum blade length in hand baggage", "cm",
+             ("knife", "knives", "penknife"),
+             r"Knives with blades of more than (\d+)cm", hand_baggage_only=True),
+    FactRule("scissors", "maximum blade length in hand baggage", "cm",
+             ("scissors",),
+             r"Scissors with blades of more than (\d+)cm", hand_baggage_only=True),
+    FactRule("oxygen cylinder", "maximum weight per cylinder", "kg",
+             ("oxygen cylinder", "oxygen cylinders", "oxygen"),
+             r"Maximum weight per cylinder: (\d+)kg"),
+    FactRule("bicycle box or bag", "maximum size", "cm",
+             ("bike", "bicycle"),
+             r"Maximum size: (\d+ x \d+ x \d+) ?cm"),
+    FactRule("ski or snowboard bag", "maximum packed size", "cm",
+             ("ski", "snowboard"),
+             r"Maximum packed size: (\d+ x \d+ x \d+) ?cm"),
+]
+
+
+class PolicyFactsIndex:
+    """In-memory index of numeric policy rules used to answer allowance checks without the LLM"""
+
+    def __init__(self, rules: List[FactRule] = None):
+        self.rules = rules if rules is not None else FACT_RULES
+        self.facts: List[PolicyFact] = []
+
+    def load_documents(self, file_path: str, source: str = None):
+        """Extract facts from a policy text file and add them to the index"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            source = source or file_path.replace("\\", "/").split("/")[-1]
+            facts = self.extract_facts(content, source=source)
+            self.facts.extend(facts)
+            print(f"📐 Extracted {len(facts)} policy facts from {file_path}")
+
+        except Exception as e:
+            print(f"❌ Error extracting policy facts: {e}")
+
+    def extract_facts(self, content: str, source: str) -> List[PolicyFact]:
+        """Run every rule over the text, remembering which section each match came from"""
+        facts = []
+        seen = set()
+        heading, subheading = "Introduction", ""
+
+        for line in content.split('\n'):
+            if line.startswith('===') or line.startswith('---'):
+                title = line.strip('= -')
+                if title and line.startswith('==='):
+                    heading, subheading = title, ""
+                elif title:
+                    subheading = title
+                continue
+
+            for rule in self.rules:
+                match = re.search(rule.pattern, line)
+                if not match:
+                    continue
+                # Some rules are repeated further down the page; keep the first statement
+                key = (rule.item, rule.constraint)
+                if key in seen:
+                    continue
+                seen.add(key)
+                facts.append(PolicyFact(
+                    item=rule.item,
+                    constraint=rule.constraint,
+                    value=self._parse_value(match.group(1)),
+                    unit=rule.unit,
+                    section=f"{heading} - {subheading}" if subheading else heading,
+                    source=source,
+                    text=line.strip(),
+                    hand_baggage_only=rule.hand_baggage_only,
+                    hold_only=rule.hold_only
+                ))
+
+        return facts
+
+    def lookup(self, query: str) -> List[PolicyFact]:
+        """Return the facts for the single item the query is clearly about, or [] if unclear"""
+        item, _ = self._match_item(query)
+        return [fact for fact in self.facts if fact.item == item] if item else []
+
+    def _match_item(self, query: str) -> Tuple[Optional[str], bool]:
+        """The item a query is about (or None if unclear), and whether other items also matched"""
+        query_lower = query.lower()
+
+        # Score each item by (matched a specific alias, longest alias), so "wine" beats
+        # "bottle". Aliases match whole words, optionally plural, so "ski" matches "skis"
+        # but not "whisky" or "skincare".
+        scores: Dict[str, Tuple[int, int]] = {}
+        spans: Dict[str, List[Tuple[int, int]]] = {}  # Where each item's aliases matched
+        best_spans: Dict[str, Tuple[int, int]] = {}
+        for rule in self.rules:
+            for specific, aliases in ((1, rule.aliases), (0, rule.generic_aliases)):
+                for alias in aliases:
+                    match = re.search(r"\b" + re.escape(alias) + r"s?\b", query_lower)
+                    if not match:
+                        continue
+                    spans.setdefault(rule.item, []).append(match.span())
+                    score = (specific, len(alias))
+                    if score > scores.get(rule.item, (0, 0)):
+                        scores[rule.item], best_spans[rule.item] = score, match.span()
+
+        if not scores:
+            return None, False
+
+        best = max(scores.values())
+        best_items = [item for item, score in scores.items() if score == best]
+        if len(best_items) != 1:
+            return None, True  # Ambiguous; let the LLM handle it
+
+        # Another item only competes if it matched outside the winning phrase; "liquid"
+        # inside "liquids bag" doesn't count
+        item = best_items[0]
+        start, end = best_spans[item]
+        contested = any(
+            not (start <= s_start and s_end <= end)
+            for other, other_spans in spans.items() if other != item
+            for s_start, s_end in other_spans
+        )
+        return item, contested
+
+    def answer(self, query: str, plan: Dict) -> Optional[Dict]:
+        """Answer an allowance check from the index, or return None to fall back to the LLM"""
+        if plan.get("intent") != "allowance-check":
+            return None
+        query_lower = query.lower()
+        if any(term in query_lower for term in _EXCEPTION_TERMS):
+            return None
+        if any(re.search(r"\b" + drink, query_lower) for drink in _LOW_ABV_DRINKS):
+            return None
+
+        item, contested = self._match_item(query)
+        facts = [fact for fact in self.facts if fact.item == item] if item else []
+        if not facts:
+            return None
+        # A hand-baggage limit would be the wrong answer for checked luggage, and vice versa
+        if _HOLD_BAGGAGE.search(query_lower) and any(fact.hand_baggage_only for fact in facts):
+            return None
+        if _HAND_BAGGAGE.search(query_lower) and any(fact.hold_only for fact in facts):
+            return None
+
+        lines = [f"Here is the British Airways rule for {facts[0].item}:", ""]
+        for fact in facts:
+            lines.append(f"- {fact.constraint[0].upper()}{fact.constraint[1:]}: {self._format_value(fact)}")
+            lines.append(f"  \"{fact.text}\" (Section: {fact.section})")
+        lines.append("")
+        lines.append("Is there anything else I can help you with regarding your journey?")
+
+        sources = []
+        for fact in facts:
+            source = {"content": fact.text, "source": f"{fact.source} - {fact.section}", "score": 1.0}
+            if source not in sources:  # Several facts can come from one sentence
+                sources.append(source)
+
+        return {
+            "response": "\n".join(lines),
+            "sources": sources,
+            "confidence": _CONTESTED_CONFIDENCE if contested else _CONFIDENCE
+        }
+
+    def _parse_value(self, raw: str) -> Union[float, Tuple[float, ...]]:
+        """Parse '100', '2.5', 'five' or '20 x 20' into a number or a tuple of numbers"""
+        raw = raw.strip().lower()
+        if " x " in raw:
+            return tuple(float(part) for part in raw.split(" x "))
+        if raw in _WORD_NUMBERS:
+            return float(_WORD_NUMBERS[raw])
+        return float(raw)
+
+    def _format_value(self, fact: PolicyFact) -> str:
+        """Render a value with its unit, e.g. '100ml' or '20 x 20cm'"""
+        def number(value: float) -> str:
+            return f"{value:g}"
+
+        if isinstance(fact.value, tuple):
+            return " x ".join(number(v) for v in fact.value) + fact.unit
+        separator = " " if fact.unit.startswith("litre") else ""
+        return f"{number(fact.value)}{separator}{fact.unit}"
@@ -0,0 +1,183 @@
+# backend/database/quantized_index.py
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class QuantizedIndex:
+    """Flat cosine index holding int8 embeddings in memory and float32 copies on disk.
+
+    Each unit-normalized vector is stored as int8 with its own scale (max |x| / 127),
+    roughly a quarter of the float32 footprint. Searches score every vector at int8
+    precision, then rescore the best `rescore_k` candidates against the float32
+    copies, which are memory-mapped so only those rows are read.
+    """
+
+    BLOCK_ROWS = 4096  # Rows dequantized at a time while scanning
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict] = []
+        self.codes = np.zeros((0, 0), dtype=np.int8)
+        self.scales = np.zeros(0, dtype=np.float32)
+        self.full_precision = None  # np.memmap of float32 vectors, opened lazily
+        self._pending_codes: List[np.ndarray] = []
+        self._pending_scales: List[np.ndarray] = []
+
+        os.makedirs(index_dir, exist_ok=True)
+        self._load()
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.index_dir, "vectors.f32")
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: List[str], embeddings: List[List[float]], documents: List[str], metadatas: List[Dict]):
+        """Quantize and append a batch; the float32 vectors are streamed straight to disk"""
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.round(vectors / scales[:, None]).astype(np.int8)
+
+        with open(self._vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+
+        self._pending_codes.append(codes)
+        self._pending_scales.append(scales.astype(np.float32))
+        self.ids.extend(ids)
+        self.documents.extend(documents)
+        self.metadatas.extend(metadatas)
+        self.full_precision = None
+
+    def save(self):
+        """Write the int8 codes, scales and chunk texts next to the float32 vectors"""
+        self._merge_pending()
+        np.save(os.path.join(self.index_dir, "codes.npy"), self.codes)
+        np.save(os.path.join(self.index_dir, "scales.npy"), self.scales)
+        with open(os.path.join(self.index_dir, "chunks.json"), "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "documents": self.documents, "metadatas": self.metadatas}, f)
+
+    def clear(self):
+        """Drop every vector, in memory and on disk"""
+        self.ids, self.documents, self.metadatas = [], [], []
+        self.codes = np.zeros((0, 0), dtype=np.int8)
+        self.scales = np.zeros(0, dtype=np.float32)
+        self.full_precision = None
+        self._pending_codes, self._pending_scales = [], []
+        for name in ("chunks.json", "codes.npy", "scales.npy", "vectors.f32"):
+            path = os.path.join(self.index_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        rescore_k: int = 0,
+        category: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """Return the top_k chunks per query, rescoring max(rescore_k, 4 * top_k) candidates at full precision"""
+        if self.count() == 0:
+            return [[] for _ in query_embeddings]
+
+        self._merge_pending()
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        approx = self._approximate_scores(queries)
+
+        eligible = self.count()
+        if category:
+            mask = np.array([m.get("category") != category for m in self.metadatas])
+            approx[:, mask] = -np.inf
+            eligible = int((~mask).sum())
+            if eligible == 0:
+                return [[] for _ in query_embeddings]
+
+        rescore_k = min(max(rescore_k, 4 * top_k), eligible)
+        top_k = min(top_k, eligible)
+        candidates = np.argpartition(-approx, rescore_k - 1, axis=1)[:, :rescore_k]
+
+        vectors = self._full_precision()
+        results = []
+        for query, rows in zip(queries, candidates):
+            rows = np.sort(rows)  # Sequential reads from the memory map
+            exact = vectors[rows] @ query
+            order = np.argsort(-exact)[:top_k]
+            results.append([
+                {
+                    "id": self.ids[rows[i]],
+                    "text": self.documents[rows[i]],
+                    "source": self.metadatas[rows[i]].get("source", ""),
+                    "score": float(exact[i]),
+                    "metadata": self.metadatas[rows[i]]
+                }
+                for i in order
+            ])
+        return results
+
+    def memory_bytes(self) -> int:
+        """Resident size of the vector data (int8 codes plus scales)"""
+        self._merge_pending()
+        return self.codes.nbytes + self.scales.nbytes
+
+    def _approximate_scores(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine scores at int8 precision, dequantizing a block of rows at a time"""
+        scores = np.empty((len(queries), self.count()), dtype=np.float32)
+        for start in range(0, self.count(), self.BLOCK_ROWS):
+            end = start + self.BLOCK_ROWS
+            block = self.codes[start:end].astype(np.float32)
+            scores[:, start:end] = (queries @ block.T) * self.scales[start:end]
+        return scores
+
+    def _full_precision(self) -> np.ndarray:
+        if self.full_precision is None:
+            self.full_precision = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(self.count(), self.codes.shape[1])
+            )
+        return self.full_precision
+
+    def _merge_pending(self):
+        if not self._pending_codes:
+            return
+        existing = [self.codes] if self.codes.size else []
+        self.codes = np.concatenate(existing + self._pending_codes)
+        self.scales = np.concatenate([self.scales] + self._pending_scales)
+        self._pending_codes, self._pending_scales = [], []
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _load(self):
+        chunks_path = os.path.join(self.index_dir, "chunks.json")
+        if not os.path.exists(chunks_path):
+            # Drop float32 rows left over from an ingest that never reached save()
+            if os.path.exists(self._vectors_path):
+                os.remove(self._vectors_path)
+            return
+        try:
+            with open(chunks_path, "r", encoding="utf-8") as f:
+                chunks = json.load(f)
+            self.ids = chunks["ids"]
+            self.documents = chunks["documents"]
+            self.metadatas = chunks["metadatas"]
+            self.codes = np.load(os.path.join(self.index_dir, "codes.npy"))
+            self.scales = np.load(os.path.join(self.index_dir, "scales.npy"))
+            # Drop float32 rows appended by an ingest that crashed before save()
+            if os.path.exists(self._vectors_path):
+                with open(self._vectors_path, "r+b") as f:
+                    f.truncate(self.codes.nbytes * 4)
+            print(f"✅ Loaded int8 index with {self.count()} chunks")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Could not load int8 index, rebuilding: {e}")
+            self.ids, self.documents, self.metadatas = [], [], []
+            self.codes = np.zeros((0, 0), dtype=np.int8)
+            self.scales = np.zeros(0, dtype=np.float32)
+            if os.path.exists(self._vectors_path):
+                os.remove(self._vectors_path)
@@ -3,12 +3,22 @@ import chromadb
 from chromadb.config import Settings
 from openai import OpenAI
 import os
+import time
 from typing import List, Dict
 
+from database.ingestion import corpus_fingerprint, ingest_directory, list_policy_files, parse_file
+from database.quantized_index import QuantizedIndex
+
+EMBEDDING_RETRIES = 3
+QUERY_EMBEDDING_BATCH = 256  # Well under the API's 2048 inputs per embeddings call
+
 class VectorStore:
-    """Handles document storage and retrieval using ChromaDB"""
+    """Handles document storage and retrieval using ChromaDB, or an int8 index when quantize=True"""
     
-    def __init__(self, persist_dir="./chroma_db"):
+    def __init__(self, persist_dir="./chroma_db", quantize=False):
+        self.quantize = quantize
+        # Fingerprint of the corpus the index was built from, written once an ingest completes
+        self.version_file = os.path.join(persist_dir, "corpus_version")
         try:
             from dotenv import load_dotenv
             load_dotenv()
@@ -19,16 +29,17 @@ class VectorStore:
                 self.initialized = False
                 return
 
-            self.client = chromadb.PersistentClient(path=persist_dir)
             self.openai_client = OpenAI(api_key=api_key)
             
-            self.collection = self.client.get_or_create_collection(
-                name="ba_policies",
-                metadata={"hnsw:space": "cosine"}
-            )
+            if quantize:
+                self.index = QuantizedIndex(os.path.join(persist_dir, "int8_index"))
+            else:
+                self.client = chromadb.PersistentClient(path=persist_dir)
+                self._open_collection()
             
             self.initialized = True
-            print("✅ Vector store initialized successfully (OpenAI Embeddings)")
+            backend = "int8 index" if quantize else "ChromaDB"
+            print(f"✅ Vector store initialized successfully (OpenAI Embeddings, {backend})")
             
         except Exception as e:
             print(f"⚠️ Vector store initialization failed: {e}")
@@ -46,6 +57,27 @@ class VectorStore:
             print(f"❌ Error generating embedding: {e}")
             return []
 
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts in a single OpenAI call"""
+        if not texts:
+            return []
+        try:
+            response = self.openai_client.embeddings.create(
+                input=texts,
+                model="text-embedding-3-small"
+            )
+            # The API tags each embedding with its input index; keep input order
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except Exception as e:
+            print(f"❌ Error generating batch embeddings: {e}")
+            return []
+
+    def count(self) -> int:
+        """Number of chunks in the index"""
+        if not self.initialized:
+            return 0
+        return self.index.count() if self.quantize else self.collection.count()
+
     def load_documents(self, file_path: str):
         """Load BA policies from text file"""
         if not self.initialized:
@@ -54,51 +86,100 @@ class VectorStore:
         
         try:
             # Check if documents already exist
-            if self.collection.count() > 0:
-                print(f"✅ Vector store already populated ({self.collection.count()} documents). Skipping load.")
+            if self.count() > 0:
+                print(f"✅ Vector store already populated ({self.count()} documents). Skipping load.")
                 return
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            chunks = parse_file(file_path)
             
-            # Split into sections
-            sections = self._split_into_sections(content)
+            print(f"📄 Loading {len(chunks)} sections into vector store...")
             
-            print(f"📄 Loading {len(sections)} sections into vector store...")
+            added = self.add_chunks(chunks)
+            self.finish_ingest()
             
-            # Add to vector store
-            ids = []
-            embeddings = []
-            documents = []
-            metadatas = []
+            print(f"✅ Successfully loaded {added} sections")
             
-            # Batch process for efficiency (if needed, but simple loop assumes small doc count)
-            for i, section in enumerate(sections):
-                embedding = self.get_embedding(section["text"])
-                if not embedding:
-                    continue
-                    
-                ids.append(f"doc_{i}")
-                embeddings.append(embedding)
-                documents.append(section["text"])
-                metadatas.append({
-                    "source": "ba_liquids_and_restrictions.txt",
-                    "section": section["title"],
-                    "category": section["category"]
-                })
-                
-            if ids:
-                self.collection.add(
-                    ids=ids,
-                    embeddings=embeddings,
-                    documents=documents,
-                    metadatas=metadatas
-                )
+        except Exception as e:
+            print(f"❌ Error loading documents: {e}")
+    
+    def load_directory(self, data_dir: str, workers: int = None, batch_size: int = 256, corpus_version: str = None):
+        """Load every policy file in a directory, parsing files in a process pool.
+        
+        The index is rebuilt whenever the corpus fingerprint differs from the one it was
+        built from, so added or edited files are picked up on the next start.
+        """
+        if not self.initialized:
+            print("Vector store not initialized")
+            return
+        
+        try:
+            if corpus_version is None:
+                corpus_version = corpus_fingerprint(list_policy_files(data_dir), data_dir)
             
-            print(f"✅ Successfully loaded {len(ids)} sections")
+            if self.count() > 0:
+                if self._stored_corpus_version() == corpus_version:
+                    print(f"✅ Vector store already populated ({self.count()} documents). Skipping load.")
+                    return
+                print(f"🔄 Policy corpus changed; rebuilding vector store ({self.count()} documents)")
+                self.reset()
+            
+            # Forget the old version first, so an ingest that dies halfway is redone next start
+            self._write_corpus_version(None)
+            ingest_directory(self, data_dir, workers=workers, batch_size=batch_size)
+            self._write_corpus_version(corpus_version)
             
         except Exception as e:
             print(f"❌ Error loading documents: {e}")
+            # Don't serve (or, for ChromaDB, keep) a partial index; it is rebuilt on the next start
+            try:
+                self.reset()
+            except Exception as reset_error:
+                print(f"❌ Error discarding partial index: {reset_error}")
+    
+    def reset(self):
+        """Drop every chunk from the index"""
+        if self.quantize:
+            self.index.clear()
+        else:
+            self.client.delete_collection("ba_policies")
+            self._open_collection()
+    
+    def add_chunks(self, chunks: List[Dict]) -> int:
+        """Embed a batch of parsed chunks with one OpenAI call and add them to the index"""
+        if not chunks:
+            return 0
+        
+        texts = [chunk["text"] for chunk in chunks]
+        embeddings = self.get_embeddings(texts)
+        for attempt in range(1, EMBEDDING_RETRIES):
+            if len(embeddings) == len(chunks):
+                break
+            time.sleep(2 ** attempt)  # Back off on rate limits and transient API errors
+            print(f"🔁 Retrying embeddings for {len(chunks)} chunks (attempt {attempt + 1}/{EMBEDDING_RETRIES})")
+            embeddings = self.get_embeddings(texts)
+        if len(embeddings) != len(chunks):
+            # Dropping the batch would leave a permanent gap in the index; abort the ingest
+            raise RuntimeError(f"embedding failed for {len(chunks)} chunks after {EMBEDDING_RETRIES} attempts")
+        
+        ids = [chunk["id"] for chunk in chunks]
+        documents = [chunk["text"] for chunk in chunks]
+        metadatas = [chunk["metadata"] for chunk in chunks]
+        
+        if self.quantize:
+            self.index.add(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+        else:
+            self.collection.add(
+                ids=ids,
+                embeddings=embeddings,
+                documents=documents,
+                metadatas=metadatas
+            )
+        return len(ids)
+    
+    def finish_ingest(self):
+        """Persist anything buffered during ingestion (ChromaDB writes through on add)"""
+        if self.quantize:
+            self.index.save()
     
     def search(self, query: str, query_type: str = "general", top_k: int = 5) -> List[Dict]:
         """Search for relevant documents"""
@@ -110,6 +191,10 @@ class VectorStore:
             if not query_embedding:
                 return []
             
+            if self.quantize:
+                category = query_type if query_type != "general" else None
+                return self.index.search_batch([query_embedding], top_k=top_k, category=category)[0]
+            
             # Search with optional category filter
             if query_type != "general":
                 results = self.collection.query(
@@ -123,71 +208,84 @@ class VectorStore:
                     n_results=top_k
                 )
             
-            # Format results
-            formatted_results = []
-            if results["documents"] and len(results["documents"][0]) > 0:
-                for i in range(len(results["documents"][0])):
-                    formatted_results.append({
-                        "text": results["documents"][0][i],
-                        "source": results["metadatas"][0][i].get("source", ""),
-                        "score": 1.0 - results["distances"][0][i],  # Convert distance to similarity
-                        "metadata": results["metadatas"][0][i]
-                    })
-            
-            return formatted_results
+            return self._format_results(results, 0)
             
         except Exception as e:
             print(f"❌ Search error: {e}")
             return []
     
-    def _split_into_sections(self, content: str) -> List[Dict]:
-        """Split content into meaningful sections"""
-        sections = []
-        lines = content.split('\n')
+    def search_batch(self, queries: List[str], query_type: str = "general", top_k: int = 5) -> List[List[Dict]]:
+        """Search for several queries, embedding them in as few OpenAI calls as possible.
         
-        current_section = {"title": "Introduction", "text": "", "category": "general"}
-        current_text = []
+        Raises instead of returning empty results, so the caller can tell a failed
+        search from one that found nothing.
+        """
+        if not queries:
+            return []
+        if not self.initialized:
+            raise RuntimeError("vector store not initialized")
         
-        for line in lines:
-            # Check if this is a section header
-            if line.startswith('===') or line.startswith('---'):
-                # Save previous section if it has content
-                if current_text:
-                    current_section["text"] = '\n'.join(current_text).strip()
-                    if len(current_section["text"]) > 50:  # Only add substantial sections
-                        sections.append(current_section.copy())
-                    current_text = []
-                
-                # Start new section
-                current_section["title"] = line.strip('= -')
-                current_section["category"] = self._categorize(line)
-            else:
-                if line.strip():
-                    current_text.append(line)
+        query_embeddings = []
+        for start in range(0, len(queries), QUERY_EMBEDDING_BATCH):
+            batch = queries[start:start + QUERY_EMBEDDING_BATCH]
+            embeddings = self.get_embeddings(batch)
+            if len(embeddings) != len(batch):
+                raise RuntimeError(f"embedding failed for {len(batch)} queries")
+            query_embeddings.extend(embeddings)
+        
+        if self.quantize:
+            category = query_type if query_type != "general" else None
+            return self.index.search_batch(query_embeddings, top_k=top_k, category=category)
         
-        # Add last section
-        if current_text:
-            current_section["text"] = '\n'.join(current_text).strip()
-            if len(current_section["text"]) > 50:
-                sections.append(current_section)
+        if query_type != "general":
+            results = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=top_k,
+                where={"category": query_type}
+            )
+        else:
+            results = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=top_k
+            )
         
-        return sections
+        return [self._format_results(results, i) for i in range(len(queries))]
     
-    def _categorize(self, title: str) -> str:
-        """Categorize section based on title"""
-        title_lower = title.lower()
+    def _open_collection(self):
+        self.collection = self.client.get_or_create_collection(
+            name="ba_policies",
+            metadata={"hnsw:space": "cosine"}
+        )
+    
+    def _stored_corpus_version(self) -> str:
+        if not os.path.exists(self.version_file):
+            return ""
+        with open(self.version_file, "r") as f:
+            return f.read().strip()
+    
+    def _write_corpus_version(self, version: str):
+        if version is None:
+            if os.path.exists(self.version_file):
+                os.remove(self.version_file)
+            return
+        with open(self.version_file, "w") as f:
+            f.write(version)
+    
+    def _format_results(self, results: Dict, query_index: int) -> List[Dict]:
+        """Format the ChromaDB results for one query of a (possibly batched) search"""
+        formatted_results = []
+        if results["documents"] and len(results["documents"][query_index]) > 0:
+            documents = results["documents"][query_index]
+            metadatas = results["metadatas"][query_index]
+            distances = results["distances"][query_index]
+            ids = results["ids"][query_index]
+            for i in range(len(documents)):
+                formatted_results.append({
+                    "id": ids[i],
+                    "text": documents[i],
+                    "source": metadatas[i].get("source", ""),
+                    "score": 1.0 - distances[i],  # Convert distance to similarity
+                    "metadata": metadatas[i]
+                })
         
-        if any(word in title_lower for word in ["liquid", "powder", "gel", "aerosol"]):
-            return "liquids"
-        elif any(word in title_lower for word in ["medical", "medicine", "pregnant", "health"]):
-            return "medical"
-        elif any(word in title_lower for word in ["sport", "bike", "golf", "ski", "equipment"]):
-            return "sports"
-        elif any(word in title_lower for word in ["prohibited", "forbidden", "restricted", "banned"]):
-            return "prohibited"
-        elif any(word in title_lower for word in ["battery", "electronic", "device", "laptop"]):
-            return "electronics"
-        elif any(word in title_lower for word in ["baggage", "luggage", "bag", "allowance"]):
-            return "baggage"
-        else:
-            return "general"
\ No newline at end of file
+        return formatted_results
@@ -0,0 +1,155 @@
+# backend/database/verdict_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class VerdictCache:
+    """Bounded LRU cache of evaluator confidence scores, optionally persisted to JSON.
+
+    Keys are a hash of the normalized response text plus the ordered source IDs, so a
+    cached verdict is only reused when the exact same answer is checked against the
+    exact same sources. Entries belong to a corpus version and are dropped when it changes.
+    The file is rewritten every `save_every` new verdicts, on corpus change and on save().
+    """
+
+    def __init__(self, max_entries: int = 2048, cache_file: Optional[str] = None, save_every: int = 100):
+        self.max_entries = max_entries
+        self.cache_file = cache_file
+        self.save_every = save_every
+        self.corpus_version = ""
+        self.verdicts = OrderedDict()  # {key: confidence}
+        self.hits = 0
+        self.misses = 0
+        self.verifications = 0
+        self.verification_seconds = 0.0  # Total time spent on the verifications that were stored
+        self._lock = threading.Lock()  # Verifications run in worker threads
+        self._unsaved = 0  # Verdicts stored since the file was last written
+        self._generation = 0  # Bumped on every snapshot, so an older one never overwrites a newer
+        self._saved_generation = 0
+        self._save_lock = threading.Lock()  # Serializes file writes, which happen outside self._lock
+
+        if cache_file:
+            self._load()
+
+    def make_key(self, response_text: str, sources: List[Dict]) -> str:
+        """Fingerprint a (response, sources) pair"""
+        normalized = " ".join(response_text.lower().split())
+        source_ids = [self._source_id(s) for s in sources]
+        payload = json.dumps([normalized, source_ids])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[float]:
+        """Return the cached confidence for a key, or None on a miss"""
+        with self._lock:
+            if key not in self.verdicts:
+                self.misses += 1
+                return None
+            self.verdicts.move_to_end(key)
+            self.hits += 1
+            return self.verdicts[key]
+
+    def put(self, key: str, confidence: float, elapsed: float = 0.0):
+        """Store a verdict, recording how long the verification took"""
+        with self._lock:
+            self.verdicts[key] = confidence
+            self.verdicts.move_to_end(key)
+            self.verifications += 1
+            self.verification_seconds += elapsed
+            while len(self.verdicts) > self.max_entries:
+                self.verdicts.popitem(last=False)
+            self._unsaved += 1
+            snapshot = self._snapshot() if self._unsaved >= self.save_every else None
+        self._write(snapshot)
+
+    def set_corpus_version(self, version: str):
+        """Invalidate all verdicts if the policy corpus has changed since they were cached"""
+        with self._lock:
+            if version == self.corpus_version:
+                return
+            if self.verdicts:
+                print(f"🗑️ Corpus changed; discarding {len(self.verdicts)} cached evaluator verdicts")
+            self.verdicts.clear()
+            self.corpus_version = version
+            snapshot = self._snapshot()
+        self._write(snapshot)
+
+    def clear(self):
+        """Drop every cached verdict"""
+        with self._lock:
+            self.verdicts.clear()
+            snapshot = self._snapshot()
+        self._write(snapshot)
+
+    def save(self):
+        """Write any verdicts stored since the last save (called on shutdown)"""
+        with self._lock:
+            snapshot = self._snapshot() if self._unsaved else None
+        self._write(snapshot)
+
+    def stats(self) -> Dict:
+        """Hit rate and the evaluator time saved by hits (estimated from the average verification)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_seconds = self.verification_seconds / self.verifications if self.verifications else 0.0
+            return {
+                "entries": len(self.verdicts),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "avg_verification_seconds": round(avg_seconds, 3),
+                "estimated_seconds_saved": round(self.hits * avg_seconds, 2)
+            }
+
+    def _source_id(self, source: Dict) -> str:
+        """Vector store chunk ID, or a content hash for sources without one (fallback context)"""
+        if source.get("id"):
+            return source["id"]
+        return hashlib.sha256(source.get("content", "").encode("utf-8")).hexdigest()[:16]
+
+    def _load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            self.corpus_version = data.get("corpus_version", "")
+            self.verdicts = OrderedDict(data.get("verdicts", {}))
+            print(f"✅ Loaded {len(self.verdicts)} cached evaluator verdicts")
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Could not load evaluator cache: {e}")
+
+    def _snapshot(self) -> Optional[Dict]:
+        """Copy of the cache to write out; call with self._lock held"""
+        if not self.cache_file:
+            return None
+        self._unsaved = 0
+        self._generation += 1
+        return {
+            "generation": self._generation,
+            "data": {"corpus_version": self.corpus_version, "verdicts": dict(self.verdicts)}
+        }
+
+    def _write(self, snapshot: Optional[Dict]):
+        """Atomically replace the cache file: a crash mid-write leaves the previous file intact"""
+        if snapshot is None:
+            return
+        with self._save_lock:
+            if snapshot["generation"] <= self._saved_generation:
+                return
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.cache_file)),
+                                                prefix=".verdicts-", suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(snapshot["data"], f)
+                os.replace(tmp_path, self.cache_file)
+                self._saved_generation = snapshot["generation"]
+            except OSError as e:
+                print(f"⚠️ Could not save evaluator cache: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
@@ -1,10 +1,15 @@
 # backend/main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 import uvicorn
+import asyncio
+import json
 import os
+import time
 import uuid
 
 # Import agents
@@ -13,7 +18,10 @@ from agents.retriever import RetrieverAgent
 from agents.reasoner import ReasonerAgent
 from agents.evaluator import EvaluatorAgent
 from database.vector_store import VectorStore
+from database.ingestion import corpus_fingerprint, list_policy_files, source_name
 from database.memory import ConversationMemory
+from database.policy_facts import PolicyFactsIndex
+from database.verdict_cache import VerdictCache
 
 app = FastAPI(title="BA Chatbot API - Agentic System with Memory", version="2.1.0")
 
@@ -28,21 +36,47 @@ app.add_middleware(
 # Initialize components
 print("🚀 Initializing BA Chatbot Agent System...")
 
-vector_store = VectorStore()
+# Set VECTOR_STORE_DIR to keep the index somewhere other than ./chroma_db (e.g. for load tests)
+# Set VECTOR_QUANTIZATION=int8 to keep embeddings as int8 (about 4x smaller) instead of in ChromaDB
+vector_store = VectorStore(
+    persist_dir=os.getenv("VECTOR_STORE_DIR", "./chroma_db"),
+    quantize=os.getenv("VECTOR_QUANTIZATION", "").lower() == "int8"
+)
+policy_facts = PolicyFactsIndex()
+# Set EVALUATOR_CACHE_FILE to keep evaluator verdicts across restarts
+verdict_cache = VerdictCache(cache_file=os.getenv("EVALUATOR_CACHE_FILE"))
 
-# Load BA policy documents if available
-data_file = "../data/ba_liquids_and_restrictions.txt"
-if os.path.exists(data_file):
-    print(f"📚 Loading BA policy documents from {data_file}")
-    vector_store.load_documents(data_file)
-else:
-    print(f"⚠️ Warning: {data_file} not found. Using fallback responses.")
+data_dir = os.getenv("POLICY_DATA_DIR", "../data")
+# Agents call the OpenAI SDK through asyncio.to_thread. The default pool of min(32, cpus + 4)
+# threads would cap concurrent LLM calls well below what /chat/batch and /chat allow.
+agent_threads = int(os.getenv("AGENT_THREADS", "64"))
+
+def load_policy_corpus():
+    """Ingest the policy documents into the vector store and the facts index.
+    
+    Called from the startup hook rather than at import time: ingestion runs in a
+    process pool, and spawned workers re-import this module.
+    """
+    policy_files = list_policy_files(data_dir) if os.path.isdir(data_dir) else []
+    if not policy_files:
+        print(f"⚠️ Warning: no policy documents found in {data_dir}. Using fallback responses.")
+        # Verdicts persisted for an earlier corpus must not be reused against the fallback context
+        verdict_cache.set_corpus_version(corpus_fingerprint([]))
+        return
+    
+    print(f"📚 Loading {len(policy_files)} BA policy documents from {data_dir}")
+    # The vector index and the evaluator cache are both tied to this exact corpus
+    corpus_version = corpus_fingerprint(policy_files, data_dir)
+    vector_store.load_directory(data_dir, corpus_version=corpus_version)
+    for policy_file in policy_files:
+        policy_facts.load_documents(policy_file, source=source_name(policy_file, data_dir))
+    verdict_cache.set_corpus_version(corpus_version)
 
 # Initialize agents
 planner = PlannerAgent()
 retriever = RetrieverAgent(vector_store)
 reasoner = ReasonerAgent()
-evaluator = EvaluatorAgent()
+evaluator = EvaluatorAgent(verdict_cache=verdict_cache)
 
 # Initialize conversation memory
 memory = ConversationMemory()
@@ -50,6 +84,15 @@ memory = ConversationMemory()
 print("✅ All agents initialized successfully!")
 print("🧠 Conversation memory enabled!")
 
+@app.on_event("startup")
+async def startup():
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=agent_threads))
+    load_policy_corpus()
+
+@app.on_event("shutdown")
+async def shutdown():
+    verdict_cache.save()
+
 class ChatRequest(BaseModel):
     message: str
     conversation_id: Optional[str] = None
@@ -65,14 +108,24 @@ async def health_check():
     return {
         "status": "healthy",
         "version": "2.1.0",
-        "features": ["agents", "vector_store", "conversation_memory"],
+        "features": ["agents", "vector_store", "conversation_memory", "policy_facts"],
         "agents": ["planner", "retriever", "reasoner", "evaluator"],
-        "vector_store": "active" if vector_store.initialized else "inactive"
+        "vector_store": "active" if vector_store.initialized else "inactive",
+        "evaluator_cache": verdict_cache.stats(),
+        "conversation_memory": memory.stats()
     }
 
+def _server_timing(timings: Dict[str, float]) -> str:
+    """Format per-stage durations (ms) as a Server-Timing header value"""
+    return ", ".join(f"{stage};dur={ms:.1f}" for stage, ms in timings.items())
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    """Main chat endpoint with full agentic workflow and conversation memory"""
+async def chat(request: ChatRequest, http_response: Response):
+    """Main chat endpoint with full agentic workflow and conversation memory.
+    
+    Per-stage durations are returned in the Server-Timing header for load testing.
+    """
+    timings = {}
     try:
         # Generate conversation ID if not provided
         conversation_id = request.conversation_id or str(uuid.uuid4())
@@ -87,33 +140,57 @@ async def chat(request: ChatRequest):
         
         # Step 1: Planner Agent - Analyze query and create plan
         print("🧠 Planner: Analyzing query...")
+        stage_start = time.perf_counter()
         plan = await planner.create_plan(request.message)
+        timings["planner"] = (time.perf_counter() - stage_start) * 1000
         print(f"   → Query type: {plan['query_type']}")
         
+        # Allowance checks with a direct hit in the facts index skip the LLM pipeline
+        stage_start = time.perf_counter()
+        fact_answer = policy_facts.answer(request.message, plan)
+        timings["facts"] = (time.perf_counter() - stage_start) * 1000
+        if fact_answer:
+            http_response.headers["Server-Timing"] = _server_timing(timings)
+            print(f"📐 Policy facts: Answered from {len(fact_answer['sources'])} indexed fact(s)")
+            memory.add_message(conversation_id, "user", request.message)
+            memory.add_message(conversation_id, "assistant", fact_answer["response"])
+            return ChatResponse(
+                response=fact_answer["response"],
+                conversation_id=conversation_id,
+                sources=fact_answer["sources"],
+                confidence=fact_answer["confidence"]
+            )
+        
         # Step 2: Retriever Agent - Get relevant information
         print("🔍 Retriever: Searching for relevant information...")
+        stage_start = time.perf_counter()
         retrieved_docs = await retriever.retrieve(
             query=request.message,
             plan=plan
         )
+        timings["retriever"] = (time.perf_counter() - stage_start) * 1000
         print(f"   → Found {len(retrieved_docs)} relevant documents")
         
         # Step 3: Reasoner Agent - Generate response with conversation context
         print("💡 Reasoner: Generating response with conversation context...")
+        stage_start = time.perf_counter()
         response = await reasoner.generate_response(
             query=request.message,
             context=retrieved_docs,
             plan=plan,
             conversation_context=conversation_context
         )
+        timings["reasoner"] = (time.perf_counter() - stage_start) * 1000
         
         # Step 4: Evaluator Agent - Validate and score
         print("✅ Evaluator: Validating response...")
+        stage_start = time.perf_counter()
         evaluation = await evaluator.evaluate(
             query=request.message,
             response=response,
             sources=retrieved_docs
         )
+        timings["evaluator"] = (time.perf_counter() - stage_start) * 1000
         print(f"   → Confidence: {evaluation['confidence']:.2f}")
         
         # Step 5: Save to conversation memory
@@ -121,6 +198,7 @@ async def chat(request: ChatRequest):
         memory.add_message(conversation_id, "assistant", evaluation["response"])
         print(f"💾 Saved to conversation memory")
         
+        http_response.headers["Server-Timing"] = _server_timing(timings)
         return ChatResponse(
             response=evaluation["response"],
             conversation_id=conversation_id,
@@ -132,6 +210,135 @@ async def chat(request: ChatRequest):
         print(f"❌ Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+class BatchChatRequest(BaseModel):
+    messages: List[ChatRequest] = Field(max_length=500)
+    max_concurrency: int = Field(default=8, ge=1, le=32)
+
+async def _answer_batch_item(index: int, item: ChatRequest, plan: Dict, retrieved_docs: List[Dict]) -> Dict:
+    """Run the reasoner and evaluator for one item of a batch"""
+    try:
+        # Only items that belong to an existing conversation touch memory, so bulk
+        # regression runs don't leave hundreds of one-off conversations behind
+        conversation_context = memory.get_context_string(item.conversation_id) if item.conversation_id else ""
+        
+        response = await reasoner.generate_response(
+            query=item.message,
+            context=retrieved_docs,
+            plan=plan,
+            conversation_context=conversation_context
+        )
+        evaluation = await evaluator.evaluate(
+            query=item.message,
+            response=response,
+            sources=retrieved_docs
+        )
+        
+        if item.conversation_id:
+            memory.add_message(item.conversation_id, "user", item.message)
+            memory.add_message(item.conversation_id, "assistant", evaluation["response"])
+        
+        return {
+            "index": index,
+            "message": item.message,
+            "response": evaluation["response"],
+            "conversation_id": item.conversation_id,
+            "sources": evaluation["sources"],
+            "confidence": evaluation["confidence"]
+        }
+    
+    except Exception as e:
+        print(f"❌ Batch item {index} error: {str(e)}")
+        return {"index": index, "message": item.message, "error": str(e)}
+
+def _fact_batch_line(index: int, item: ChatRequest, fact_answer: Dict) -> Dict:
+    """Record a facts-index answer for one item of a batch"""
+    if item.conversation_id:
+        memory.add_message(item.conversation_id, "user", item.message)
+        memory.add_message(item.conversation_id, "assistant", fact_answer["response"])
+    return {"index": index, "message": item.message, "conversation_id": item.conversation_id, **fact_answer}
+
+@app.post("/chat/batch")
+async def chat_batch(request: BatchChatRequest):
+    """Answer a list of queries, streaming one JSON line per item as it finishes.
+    
+    All queries are embedded in one call and searched with a single multi-embedding
+    collection query; planner, reasoner and evaluator calls are fanned out with at
+    most `max_concurrency` in flight. Messages sharing a conversation_id are answered
+    one after another, in request order. Lines arrive in completion order, so each
+    carries the `index` of its message in the request.
+    """
+    if not request.messages:
+        raise HTTPException(status_code=400, detail="messages must not be empty")
+    
+    semaphore = asyncio.Semaphore(request.max_concurrency)
+    
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+    
+    async def stream_results():
+        items = request.messages
+        print(f"\n📦 Batch chat: {len(items)} queries (max concurrency {request.max_concurrency})")
+        
+        plans = await asyncio.gather(*(bounded(planner.create_plan(item.message)) for item in items))
+        
+        # Answer direct allowance-check hits from the facts index straight away, unless an
+        # earlier message of the same conversation is still waiting on the LLM
+        fact_answers = {}
+        pending = []
+        waiting = set()
+        for i, item in enumerate(items):
+            fact_answer = policy_facts.answer(item.message, plans[i])
+            if fact_answer and item.conversation_id not in waiting:
+                yield json.dumps(_fact_batch_line(i, item, fact_answer)) + "\n"
+                continue
+            if fact_answer:
+                fact_answers[i] = fact_answer
+            pending.append(i)
+            if item.conversation_id:
+                waiting.add(item.conversation_id)
+        
+        if not pending:
+            return
+        
+        to_retrieve = [i for i in pending if i not in fact_answers]
+        retrieved = {}
+        if to_retrieve:
+            print(f"🔍 Retriever: Batched search for {len(to_retrieve)} queries...")
+            retrieved = dict(zip(to_retrieve, await retriever.retrieve_batch(
+                queries=[items[i].message for i in to_retrieve],
+                plans=[plans[i] for i in to_retrieve]
+            )))
+        
+        async def answer(i, previous):
+            # Messages of one conversation run in order, so each sees the answers before it
+            if previous:
+                await asyncio.wait({previous})
+            if i in fact_answers:
+                return _fact_batch_line(i, items[i], fact_answers[i])
+            async with semaphore:
+                return await _answer_batch_item(i, items[i], plans[i], retrieved[i])
+        
+        tasks = []
+        last_in_conversation = {}
+        for i in pending:
+            conversation_id = items[i].conversation_id
+            task = asyncio.create_task(answer(i, last_in_conversation.get(conversation_id)))
+            tasks.append(task)
+            if conversation_id:
+                last_in_conversation[conversation_id] = task
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+        finally:
+            # Client went away mid-stream: don't keep paying for the remaining items
+            for task in tasks:
+                task.cancel()
+        
+        print(f"✅ Batch chat complete ({len(items)} queries)")
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.delete("/conversation/{conversation_id}")
 async def clear_conversation(conversation_id: str):
     """Clear a specific conversation history"""
@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# The backend is run from its own directory (`uvicorn main:app`), so its packages are top-level
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
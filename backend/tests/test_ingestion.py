@@ -0,0 +1,19 @@
+# backend/tests/test_ingestion.py
+import os
+import shutil
+
+from database.ingestion import list_policy_files, parse_file
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "ba_liquids_and_restrictions.txt")
+
+
+def test_chunk_ids_are_unique_across_subfolders(tmp_path):
+    for folder in ("baggage", "pets"):
+        (tmp_path / folder).mkdir()
+        shutil.copy(DATA_FILE, tmp_path / folder / "faq.txt")
+
+    chunks = [chunk for path in list_policy_files(str(tmp_path)) for chunk in parse_file(path, str(tmp_path))]
+
+    assert len({chunk["id"] for chunk in chunks}) == len(chunks)
+    assert {chunk["metadata"]["source"] for chunk in chunks} == {"baggage/faq.txt", "pets/faq.txt"}
+    assert chunks[0]["id"].startswith(chunks[0]["metadata"]["source"] + ":")
@@ -0,0 +1,108 @@
+# backend/tests/test_policy_facts.py
+import os
+
+import pytest
+
+from database.policy_facts import PolicyFactsIndex
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "ba_liquids_and_restrictions.txt")
+ALLOWANCE_CHECK = {"intent": "allowance-check"}
+
+
+@pytest.fixture(scope="module")
+def index():
+    facts_index = PolicyFactsIndex()
+    facts_index.load_documents(DATA_FILE)
+    return facts_index
+
+
+def test_extracts_typed_facts_with_sections(index):
+    facts = {(f.item, f.constraint): f for f in index.facts}
+
+    spirits = facts[("alcoholic drinks", "maximum volume per person between 24% and 70% ABV")]
+    assert spirits.value == 5.0
+    assert spirits.hold_only and not spirits.hand_baggage_only
+
+    container = facts[("liquid container", "maximum volume in hand baggage")]
+    assert container.value == 100.0
+    assert container.unit == "ml"
+    assert container.hand_baggage_only
+    assert "Liquids" in container.section
+
+    assert facts[("liquids bag", "maximum size")].value == (20.0, 20.0)
+    assert facts[("lithium-ion battery or power bank", "maximum rating without approval")].unit == "Wh"
+
+
+@pytest.mark.parametrize("query, item", [
+    ("Can I take a 150ml bottle of shampoo in my hand luggage?", "liquid container"),
+    ("How big can the liquids bag be?", "liquids bag"),
+    ("Can I bring a 2 litre bottle of vodka?", "alcoholic drinks"),
+    ("how much whisky can I bring", "alcoholic drinks"),
+    ("What is the power bank limit?", "lithium-ion battery or power bank"),
+    ("How big can my skincare bottle be?", "liquid container"),
+    ("What size can my skis be packed to?", "ski or snowboard bag"),
+])
+def test_lookup_picks_the_specific_item(index, query, item):
+    facts = index.lookup(query)
+    assert facts
+    assert {f.item for f in facts} == {item}
+
+
+@pytest.mark.parametrize("query", [
+    "Can I bring skin cream?",
+    "What is the limit on skincare?",
+])
+def test_aliases_only_match_whole_words(index, query):
+    assert "ski or snowboard bag" not in {f.item for f in index.lookup(query)}
+
+
+def test_specific_item_beats_generic_container_word(index):
+    answer = index.answer("Can I pack a 2 litre bottle of vodka in my checked bag?", ALLOWANCE_CHECK)
+    assert answer is not None
+    assert "alcoholic drinks" in answer["response"]
+    assert "100ml" not in answer["response"]
+    assert answer["confidence"] < 0.9  # "bottle" also matched the liquid container rule
+
+
+@pytest.mark.parametrize("query", [
+    "Can I take a 2 litre bottle of wine in my hand luggage?",
+    "Can I bring a 2 litre bottle of wine?",
+    "How much beer can I pack?",
+    "Can I take a litre of vodka in my cabin bag?",
+])
+def test_alcohol_limits_fall_back_for_hand_baggage_and_low_abv_drinks(index, query):
+    assert index.answer(query, ALLOWANCE_CHECK) is None
+
+
+@pytest.mark.parametrize("query", [
+    "Can I bring a container of water in checked luggage?",
+    "How many liquids can I bring in checked baggage?",
+    "kitchen knife in checked bag",
+    "Can I pack scissors in the hold?",
+])
+def test_hand_baggage_rules_fall_back_for_checked_baggage(index, query):
+    assert index.answer(query, ALLOWANCE_CHECK) is None
+
+
+@pytest.mark.parametrize("query", [
+    "How big a battery for my wheelchair?",
+    "What battery size is allowed for my mobility scooter?",
+    "e-bike battery limit?",
+    "What is the battery limit for a hoverboard?",
+    "how many spare batteries can I take?",
+])
+def test_battery_questions_outside_the_device_rule_fall_back(index, query):
+    assert index.answer(query, ALLOWANCE_CHECK) is None
+
+
+def test_falls_back_for_exceptions_and_other_intents(index):
+    assert index.answer("Can I take liquid medicine over 100ml?", ALLOWANCE_CHECK) is None
+    assert index.answer("How big can the liquids bag be?", {"intent": "informational"}) is None
+    assert index.answer("Can I bring insulin?", ALLOWANCE_CHECK) is None
+
+
+def test_answer_cites_source_section(index):
+    answer = index.answer("How big can the liquids bag be?", ALLOWANCE_CHECK)
+    assert answer["confidence"] == 0.9
+    assert len(answer["sources"]) == 1  # Both bag facts come from the same sentence
+    assert "Liquids" in answer["sources"][0]["source"]
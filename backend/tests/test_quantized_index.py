@@ -0,0 +1,89 @@
+# backend/tests/test_quantized_index.py
+import os
+
+import numpy as np
+
+from database.quantized_index import QuantizedIndex
+
+DIM = 32
+
+
+def make_chunks(n, seed=0, categories=("liquids", "baggage")):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.normal(size=(n, DIM)).astype(np.float32)
+    ids = [f"doc.txt:{i}" for i in range(n)]
+    documents = [f"chunk {i}" for i in range(n)]
+    metadatas = [{"source": "doc.txt", "category": categories[i % len(categories)]} for i in range(n)]
+    return ids, embeddings, documents, metadatas
+
+
+def build(index_dir, n=200, seed=0, **kwargs):
+    ids, embeddings, documents, metadatas = make_chunks(n, seed, **kwargs)
+    index = QuantizedIndex(str(index_dir))
+    index.add(ids=ids, embeddings=embeddings.tolist(), documents=documents, metadatas=metadatas)
+    index.save()
+    return index, embeddings
+
+
+def brute_force(embeddings, query, top_k):
+    vectors = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    scores = vectors @ (query / np.linalg.norm(query))
+    return [f"doc.txt:{i}" for i in np.argsort(-scores)[:top_k]], np.sort(scores)[::-1][:top_k]
+
+
+def test_search_matches_brute_force_cosine(tmp_path):
+    index, embeddings = build(tmp_path)
+    queries = np.random.default_rng(1).normal(size=(5, DIM)).astype(np.float32)
+
+    for query, results in zip(queries, index.search_batch(queries.tolist(), top_k=5)):
+        expected_ids, expected_scores = brute_force(embeddings, query, 5)
+        assert [r["id"] for r in results] == expected_ids
+        assert np.allclose([r["score"] for r in results], expected_scores, atol=1e-5)
+
+
+def test_save_and_reload_round_trip(tmp_path):
+    index, _ = build(tmp_path)
+    query = np.random.default_rng(2).normal(size=(1, DIM)).tolist()
+
+    reloaded = QuantizedIndex(str(tmp_path))
+
+    assert reloaded.count() == index.count()
+    assert np.array_equal(reloaded.codes, index.codes)
+    assert reloaded.search_batch(query, top_k=8) == index.search_batch(query, top_k=8)
+
+
+def test_category_filter_with_fewer_eligible_rows_than_top_k(tmp_path):
+    index, _ = build(tmp_path, n=30, categories=("liquids",) * 9 + ("medical",))
+    query = np.random.default_rng(3).normal(size=(1, DIM)).tolist()
+
+    results = index.search_batch(query, top_k=5, category="medical")[0]
+
+    assert len(results) == 3  # Rows 9, 19 and 29
+    assert {r["metadata"]["category"] for r in results} == {"medical"}
+    assert index.search_batch(query, top_k=5, category="sports") == [[]]
+
+
+def test_recovers_from_ingest_that_crashed_before_save(tmp_path):
+    index, embeddings = build(tmp_path, n=50)
+    ids, extra, documents, metadatas = make_chunks(20, seed=9)
+    # Rows reach vectors.f32 on add(), but the crash means save() never runs
+    index.add(ids=[f"new:{i}" for i in ids], embeddings=extra.tolist(), documents=documents, metadatas=metadatas)
+    del index
+
+    reloaded = QuantizedIndex(str(tmp_path))
+    query = embeddings[7]
+
+    assert reloaded.count() == 50
+    assert os.path.getsize(tmp_path / "vectors.f32") == 50 * DIM * 4
+    assert reloaded.search_batch([query.tolist()], top_k=1)[0][0]["id"] == "doc.txt:7"
+
+
+def test_drops_vectors_from_a_first_ingest_that_never_saved(tmp_path):
+    ids, embeddings, documents, metadatas = make_chunks(10)
+    QuantizedIndex(str(tmp_path)).add(ids=ids, embeddings=embeddings.tolist(), documents=documents,
+                                      metadatas=metadatas)
+
+    reloaded = QuantizedIndex(str(tmp_path))
+
+    assert reloaded.count() == 0
+    assert not (tmp_path / "vectors.f32").exists()
@@ -0,0 +1,53 @@
+# backend/tests/test_verdict_cache.py
+import json
+import os
+import threading
+
+from database.verdict_cache import VerdictCache
+
+
+def test_writes_every_n_puts_and_on_save(tmp_path):
+    cache_file = tmp_path / "verdicts.json"
+    cache = VerdictCache(cache_file=str(cache_file), save_every=3)
+
+    cache.put("a", 0.9)
+    cache.put("b", 0.8)
+    assert not cache_file.exists()
+
+    cache.put("c", 0.7)
+    assert set(json.loads(cache_file.read_text())["verdicts"]) == {"a", "b", "c"}
+
+    cache.put("d", 0.6)
+    cache.save()
+    assert VerdictCache(cache_file=str(cache_file)).get("d") == 0.6
+
+
+def test_corpus_change_is_written_immediately(tmp_path):
+    cache_file = tmp_path / "verdicts.json"
+    cache = VerdictCache(cache_file=str(cache_file), save_every=100)
+    cache.set_corpus_version("v1")
+    cache.put("a", 0.9)
+    cache.save()
+
+    reloaded = VerdictCache(cache_file=str(cache_file))
+    reloaded.set_corpus_version("v2")
+    assert json.loads(cache_file.read_text()) == {"corpus_version": "v2", "verdicts": {}}
+
+
+def test_concurrent_puts_leave_a_valid_file_and_no_temp_files(tmp_path):
+    cache_file = tmp_path / "verdicts.json"
+    cache = VerdictCache(cache_file=str(cache_file), save_every=1)
+
+    def worker(n):
+        for i in range(50):
+            cache.put(f"{n}-{i}", 0.5)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.save()
+
+    assert len(json.loads(cache_file.read_text())["verdicts"]) == 400
+    assert os.listdir(tmp_path) == ["verdicts.json"]